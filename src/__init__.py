@@ -2,7 +2,9 @@ from .custom_types.connection_details import ConnectionDetails
 from .custom_types.data_type import DataType
 from .custom_types.data_type_enum import DataTypeEnum
 from .custom_types.excel_to_db import ExcelToDB
+from .custom_types.data_frame_to_db import DataFrameToDB
 from .helper_functions.generate_id import generate_id
+from .helper_functions.hash_key import hash_key
 from .helper_functions.sql_identifier_check import ident_check
 from .helper_functions.parse_date import parse_date
 from .helper_functions.stringify_value import stringify_value
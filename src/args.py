@@ -4,7 +4,9 @@ parser = ArgumentParser(description='Excel -> DB: Read an Excel file and insert
 parser.add_argument('--env-path', '-e', type=str, dest='envpath', help='The path to the .env file to load. Defaults to .env.')
 parser.add_argument('--table-name', '-t', type=str, dest='tablename', help='The name of the table to insert the data into.')
 parser.add_argument('--json-path', '-j', type=str, dest='jsonpath', help='The path of the JSON file with column data to load.')
+parser.add_argument('--duplicate-keys', '-d', type=str, dest='duplicatekeys', choices=['error', 'first', 'last'], help='How to handle rows sharing the same key columns set in the JSON file. Defaults to error.')
 parser.add_argument('--assume-yes', '-y', action='store_true', dest='assumeyes', help='Assume yes to prompts.')
+parser.add_argument('--route-partitions', '-p', action='store_true', dest='routepartitions', help='Insert rows straight into the child partitions of a partitioned table.')
 
 group = parser.add_argument_group('XLSX Settings')
 group.add_argument('--file-path', '-f', type=str, dest='filepath', help='The path to the Excel file to load.')
@@ -0,0 +1,115 @@
+from custom_types.connection_details import ConnectionDetails
+from custom_types.data_type_enum import DataTypeEnum
+from custom_types.excel_to_db import ExcelToDB
+from typing import Any, Iterator
+
+# Number of rows to pull out of a pandas DataFrame at a time.
+PANDAS_CHUNK_SIZE = 65536
+
+class DataFrameToDB(ExcelToDB):
+	'''
+	Loads data already held in memory into the database, skipping the XLSX round trip.
+
+	Works exactly like ExcelToDB once initialised, using the column names of the data in place of the sheet header.
+
+	Supported column types are strings, integers (Including pandas' nullable Int64), floats, booleans, dates and datetimes (With or without a timezone).
+	Missing values (None, NaN, NaT and pd.NA) are inserted as NULL.
+
+	:param data: A pandas DataFrame or a pyarrow Table.
+	:param db_conn_details: The details of the database to connect to.
+	'''
+
+	# Rows are reported by their position in the data rather than a spreadsheet row number.
+	first_data_row = 0
+
+	def __init__(self, data : Any, db_conn_details : ConnectionDetails):
+		# Neither pandas nor pyarrow are imported, the data is identified by the methods it exposes.
+		if hasattr(data, 'to_batches'):
+			self.is_arrow = True
+		elif hasattr(data, 'iloc'):
+			self.is_arrow = False
+		else:
+			raise TypeError('Data must be a pandas DataFrame or a pyarrow Table.')
+
+		self.data = data
+
+		# There is no file behind in memory data.
+		super().__init__('', db_conn_details)
+
+	def _load_workbook(self):
+		'''
+		In memory data has no workbook to load.
+		'''
+		self.wb = None
+
+	def swap_active_sheet(self, sheet_name: str):
+		'''
+		In memory data has no sheets to swap between.
+		'''
+		raise TypeError('In memory data does not have sheets.')
+
+	def get_column_names(self) -> list[str]:
+		'''
+		Returns the column names of the data.
+		'''
+		if self.is_arrow:
+			return [str(column) for column in self.data.column_names]
+
+		return [str(column) for column in self.data.columns]
+
+	def normalise_value(self, value : Any, is_int : bool) -> Any:
+		'''
+		Converts a value pulled out of the data into one which will survive being converted to a string and parsed by DataType.
+
+		:param value: The value to normalise.
+		:param is_int: Whether the column the value is from is mapped to an integer.
+		'''
+		if value is None:
+			return None
+
+		# NaN and NaT are the only values not equal to themselves.
+		# pd.NA can't be compared at all, so check it by name.
+		if type(value).__name__ in ('NAType', 'NaTType') or (isinstance(value, float) and value != value):
+			return None
+
+		# An integer column with any missing values is stored as floats by pandas.
+		if is_int and isinstance(value, float) and value.is_integer():
+			return int(value)
+
+		# Pandas timestamps, convert to a plain datetime so the string form is always ISO 8601.
+		if hasattr(value, 'to_pydatetime'):
+			return value.to_pydatetime()
+
+		return value
+
+	def iter_rows(self) -> Iterator[tuple[Any, ...]]:
+		'''
+		Yields the values of each row, in the same order as get_column_names.
+
+		Values are pulled out a whole column at a time per batch so only one batch is ever converted to Python objects.
+		'''
+		int_columns = [
+			column_name in self.column_types and self.column_types[column_name].data_type in (DataTypeEnum.int, DataTypeEnum.int.value)
+			for column_name in self.get_column_names()
+		]
+
+		for columns in self.iter_column_batches():
+			columns = [[self.normalise_value(value, is_int) for value in column] for column, is_int in zip(columns, int_columns)]
+			yield from zip(*columns)
+
+	def iter_column_batches(self) -> Iterator[list[list[Any]]]:
+		'''
+		Yields the data in batches, each as a list of the values of every column.
+		'''
+		if self.is_arrow:
+			for batch in self.data.to_batches():
+				yield [batch.column(i).to_pylist() for i in range(batch.num_columns)]
+			return
+
+		for start in range(0, len(self.data), PANDAS_CHUNK_SIZE):
+			chunk = self.data.iloc[start:start + PANDAS_CHUNK_SIZE]
+			yield [chunk.iloc[:, i].tolist() for i in range(chunk.shape[1])]
+
+if __name__ == '__main__':
+	print('This is part of a library and should not be run directly.')
+	exit(1)
@@ -13,18 +13,21 @@ class DataType:
 	:param db_column_name: The name of the column in the database.
 	:param data_type: The data type the column should be converted to. Should be a value from the DataTypeEnum class, unless the type is an enumerator or other custom type in which pass a string as the name of the enumerator or type.
 	:param possible_values: A list of possible values the column can take. If None, the column can take any value.
+	:param is_key: Whether the column is part of the key used to detect duplicate rows.
 	'''
 	def __init__(
 		self,
 		table_column_name: str,
 		db_column_name: str,
 		data_type : DataTypeEnum | str,
-		possible_values: list[str] | None = None
+		possible_values: list[str] | None = None,
+		is_key: bool = False
 	):
 		self.table_column_name = table_column_name
 		self.db_column_name = db_column_name
 		self.data_type = data_type
 		self.possible_values = possible_values
+		self.is_key = is_key
 	
 	def parse(self, value: str) -> str | int | float | datetime:
 		match self.data_type:
@@ -2,33 +2,56 @@ from openpyxl import load_workbook, Workbook
 from psycopg2 import connect
 from custom_types.connection_details import ConnectionDetails
 from custom_types.data_type import DataType
+from custom_types.partition_router import PartitionRouter
 from helper_functions.sql_identifier_check import ident_check
 from helper_functions.generate_id import generate_id
+from helper_functions.hash_key import hash_key
 from datetime import datetime
+from typing import Any, Iterator
+
+# Number of rows sent per INSERT statement when writing straight to partitions.
+PARTITION_BATCH_SIZE = 1000
+
+# Number of duplicate rows to list when reporting duplicate keys.
+DUPLICATE_ROWS_LISTED = 10
 
 # When initialised, treat ExcelToDB like a cursor.
 
 class ExcelToDB:
+	# Row number of the first data row, used when reporting rows back to the user.
+	first_data_row = 2
+
 	def __init__(self, file_path : str, db_conn_details : ConnectionDetails):
 		self.file_path = file_path
 		self.db_conn_details = db_conn_details
 		self.column_types : dict[str, DataType] = {}
+		self._connect()
+		self._load_workbook()
+	
+	def _load_workbook(self):
+		'''
+		Loads the workbook from the file path provided.
+		'''
+		try:
+			self.wb : Workbook = load_workbook(self.file_path)
+		except Exception as e:
+			raise Exception(f'Error loading workbook\n{e}')
+
+	def _connect(self):
+		'''
+		Opens the database connection using the connection details provided.
+		'''
 		try:
 			self.__connection__ = connect(
-				host=db_conn_details.host,
-				port=db_conn_details.port,
-				database=db_conn_details.database,
-				user=db_conn_details.user,
-				password=db_conn_details.password
+				host=self.db_conn_details.host,
+				port=self.db_conn_details.port,
+				database=self.db_conn_details.database,
+				user=self.db_conn_details.user,
+				password=self.db_conn_details.password
 			)
 		except Exception as e:
 			raise Exception(f'Error connecting to database\n{e}')
 
-		try:
-			self.wb : Workbook = load_workbook(file_path)
-		except Exception as e:
-			raise Exception(f'Error loading workbook\n{e}')
-	
 	def swap_active_sheet(self, sheet_name: str):
 		'''
 		Swaps the active sheet in the workbook to the sheet with the name provided.
@@ -63,6 +86,18 @@ class ExcelToDB:
 		
 		return to_return
 
+	def iter_rows(self) -> Iterator[tuple[Any, ...]]:
+		'''
+		Yields the raw values of each data row in the active sheet, in the same order as get_column_names.
+		'''
+		active = self.wb.active
+
+		if not active:
+			raise TypeError('No active sheet found.')
+
+		# Skip the header row.
+		yield from active.iter_rows(min_row=2, values_only=True)
+
 	def validate_column_names(self, column_names : list[str], table_name : str) -> bool:
 		'''
 		Validates that the list of column names exist in the active sheet.
@@ -123,18 +158,85 @@ class ExcelToDB:
 		if len(self.column_types) != len(column_names):
 			raise ValueError('Not all column types have been inserted.')
 	
-	def generate_sql(self, table_name : str, randidcol : str | None = None, randidlen : int | None = None) -> list[str]:
+	def load_partitions(self, table_name : str, randidcol : str | None = None) -> PartitionRouter:
 		'''
-		Generates an SQL query to populate a table.
+		Reads the partition key and the bounds of each child partition of a partitioned table from the catalog.
+
+		:param table_name: The name of the partitioned table.
+		:param randidcol: The name of the random ID column, if one is being generated, in case the table is partitioned by it.
 		'''
+		if not ident_check(table_name):
+			raise ValueError('Table name is not a valid identifier.')
 
-		# Get the active sheet.
-		active = self.wb.active
+		# Read the partitioning strategy, along with the name, type, collation and numeric scale of the key column.
+		# Expression keys have no column (partattrs of 0) so leave the column details null.
+		cursor = self.__connection__.cursor()
+		cursor.execute(
+			'SELECT p.partstrat, p.partnatts, a.attname, '
+			'CASE WHEN t.typtype = \'e\' THEN \'enum\' ELSE t.typname END, '
+			'CASE WHEN co.collname = \'default\' THEN (SELECT datcollate FROM pg_database WHERE datname = current_database()) ELSE co.collcollate END, '
+			'a.atttypmod '
+			'FROM pg_partitioned_table p '
+			'LEFT JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0] '
+			'LEFT JOIN pg_type t ON t.oid = a.atttypid '
+			'LEFT JOIN pg_collation co ON co.oid = p.partcollation[0] '
+			'WHERE p.partrelid = %s::regclass;',
+			[table_name]
+		)
+		result = cursor.fetchone()
+
+		if not result:
+			raise ValueError(f'Table {table_name} is not partitioned.')
+
+		strategy, key_count, key_column, key_type, collation, type_modifier = result
+
+		# For numeric(p, s) the scale is stored in the low 16 bits of the type modifier, offset by 4.
+		# Scales can be negative from Postgres 15, so read it as a signed 16 bit value.
+		scale = None
+		if key_type == 'numeric' and type_modifier is not None and type_modifier >= 4:
+			scale = (type_modifier - 4) & 0xFFFF
+			if scale >= 0x8000:
+				scale -= 0x10000
+
+		if strategy not in ('r', 'l') or key_count != 1 or key_column is None:
+			raise ValueError('Only tables partitioned by RANGE or LIST on a single column can be routed.')
+
+		# Unquoted identifiers are folded to lower case, so compare against the lower case column names.
+		inserted_columns = [data_type.db_column_name for data_type in self.column_types.values()]
+		if randidcol:
+			inserted_columns.append(randidcol)
+
+		db_column_name = next((column for column in inserted_columns if column.lower() == key_column), None)
+
+		if not db_column_name:
+			raise ValueError(f'Partition key column {key_column} is not being inserted.')
+
+		router = PartitionRouter('range' if strategy == 'r' else 'list', db_column_name, key_type, collation, scale)
+
+		# Casting to regclass gives the partition name quoted and schema qualified where needed.
+		cursor.execute(
+			'SELECT c.oid::regclass::text, pg_get_expr(c.relpartbound, c.oid) '
+			'FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+			'WHERE i.inhparent = %s::regclass;',
+			[table_name]
+		)
+
+		for name, bound in cursor.fetchall():
+			try:
+				router.add_partition(name, bound)
+			except ValueError as e:
+				raise ValueError(f'Could not read bounds of partition {name}\n{e}')
+
+		return router
+
+	def generate_sql(self, table_name : str, randidcol : str | None = None, randidlen : int | None = None, duplicate_keys : str = 'error', route_partitions : bool = False) -> list[str]:
+		'''
+		Generates an SQL query to populate a table.
+
+		:param duplicate_keys: What to do when two rows share the same values in the key columns. 'error' raises a ValueError listing the duplicate rows, 'first' keeps the first row seen and 'last' keeps the last row seen.
+		:param route_partitions: If the table is partitioned, route each row to its child partition and insert into the partitions directly in batches, rather than one row at a time through the parent table.
+		'''
 
-		# Denullify the sheet.
-		if not active:
-			raise TypeError('No active sheet found.')
-		
 		# Check that the table name is a valid identifier.
 		if not ident_check(table_name):
 			raise ValueError('Table name is not a valid identifier.')
@@ -150,25 +252,46 @@ class ExcelToDB:
 			if not randidlen or randidlen < 1 or randidlen > 255:
 				raise ValueError('Random ID length must be greater than 0 and lower than 255.')
 		
-		# Generate the SQL statements.
-		statements = []
+		if duplicate_keys not in ('error', 'first', 'last'):
+			raise ValueError('Duplicate key handling must be one of error, first or last.')
 
-		for row_number in range(2, active.max_row + 1):
-			# Key: DB Column Name
-			# Value: Value to insert
-			to_insert: dict[str, str | int | float | datetime] = {}
+		# Columns which make up the key used to detect duplicate rows.
+		key_columns = [data_type.db_column_name for data_type in self.column_types.values() if data_type.is_key]
 
-			# For each column, get the value in that row.
-			for column_number in range(1, active.max_column + 1):
-				column_name = str(active.cell(row=1, column=column_number).value)
+		# Read the partition bounds once up front.
+		router = self.load_partitions(table_name, randidcol) if route_partitions else None
+
+		# Key: Digest of the key values
+		# Value: Index of the row holding that key
+		# Only a fixed size digest is kept per key so memory stays low on very large sheets.
+		seen_keys : dict[bytes, int] = {}
+
+		# Number of duplicate rows found, along with pairs of (duplicate row number, row number it duplicates) for the first few.
+		# Only the first few are kept so a sheet full of duplicates can't outgrow the key index.
+		self.duplicate_count = 0
+		self.duplicate_rows : list[tuple[int, int]] = []
+
+		# Pairs of (partition key value, row values ready to insert).
+		# Dropped duplicates are left as None and filtered out at the end.
+		rows : list[tuple[Any, str] | None] = []
+		column_names : list[str] = []
+
+		cursor = self.__connection__.cursor()
 
-				# Get data type
+		# Look up the data type of each column once rather than per row.
+		row_types = [self.column_types[column_name] for column_name in self.get_column_names()]
 
-				data_type = self.column_types[column_name]
+		for row_number, row in enumerate(self.iter_rows(), start=self.first_data_row):
+			# Key: DB Column Name
+			# Value: Value to insert
+			to_insert: dict[str, str | int | float | datetime | None] = {}
 
+			# For each column, get the value in that row.
+			for data_type, value in zip(row_types, row):
 				# Add the value to the dictionary.
+				# Empty cells and missing values are inserted as NULL rather than parsed.
 
-				to_insert[data_type.db_column_name] = data_type.parse(str(active.cell(row=row_number, column=column_number).value))
+				to_insert[data_type.db_column_name] = None if value is None else data_type.parse(str(value))
 			
 
 			# If a random ID column is to be generated, generate it.
@@ -177,23 +300,80 @@ class ExcelToDB:
 				to_insert[randidcol] = generate_id(randidlen)
 	
 			# Generate the SQL statement.
-			column_names : list[str] = list(to_insert.keys())
+			column_names = list(to_insert.keys())
 
 			if not self.validate_column_names(column_names, table_name):
 				raise ValueError('Column names do not exist in the table.')
 
-			statement = f'INSERT INTO {table_name} ({', '.join(column_names)}) VALUES ({', '.join(['%s'] * len(column_names))});'
+			# Use the connection to "mogrify" the row values.
+
+			values = cursor.mogrify(f'({', '.join(['%s'] * len(column_names))})', list(to_insert.values())).decode('utf-8')
 
-			# Use the connection to "mogrify" the statement.
+			# Keep hold of the partition key so the row can be routed once duplicates have been dropped.
+			partition_key = to_insert[router.key_column] if router else None
 
-			statement = self.__connection__.cursor().mogrify(statement, list(to_insert.values())).decode('utf-8')
+			# Check the key against the ones already seen.
+			if key_columns:
+				key = hash_key([to_insert[key_column] for key_column in key_columns])
+				seen_index = seen_keys.get(key)
 
-			# Append the statement to the list of statements.
+				if seen_index is not None:
+					# Row indexes line up with row numbers as every row gets an entry.
+					self.duplicate_count += 1
+					if len(self.duplicate_rows) < DUPLICATE_ROWS_LISTED:
+						self.duplicate_rows.append((row_number, seen_index + self.first_data_row))
 
-			statements.append(statement)
+					if duplicate_keys == 'first':
+						rows.append(None)
+						continue
+					elif duplicate_keys == 'last':
+						rows[seen_index] = None
+				
+				seen_keys[key] = len(rows)
+
+			# Append the row to the list of rows.
+
+			rows.append((partition_key, values))
 		
+		if self.duplicate_count and duplicate_keys == 'error':
+			listed = ', '.join([f'{row} (duplicates row {first})' for row, first in self.duplicate_rows])
+			more = f' and {self.duplicate_count - len(self.duplicate_rows)} more' if self.duplicate_count > len(self.duplicate_rows) else ''
+			raise ValueError(f'Duplicate keys found in rows {listed}{more}.')
+
+		columns = ', '.join(column_names)
+		statements : list[str] = []
+
+		if router:
+			# Buffer the rows for each partition and write each buffer out in batches.
+			# Key: Partition name
+			# Value: Row values
+			buffers : dict[str, list[str]] = {}
+
+			# Only rows which are being kept are routed.
+			for index, entry in enumerate(rows):
+				if entry is None:
+					continue
+
+				try:
+					partition = router.route(entry[0])
+				except ValueError as e:
+					raise ValueError(f'Could not route row {index + self.first_data_row}\n{e}')
+
+				if partition is None:
+					raise ValueError(f'No partition of {table_name} accepts row {index + self.first_data_row}.')
+
+				buffers.setdefault(partition, []).append(entry[1])
+
+			for partition, buffer in buffers.items():
+				for start in range(0, len(buffer), PARTITION_BATCH_SIZE):
+					statements.append(f'INSERT INTO {partition} ({columns}) VALUES {', '.join(buffer[start:start + PARTITION_BATCH_SIZE])};')
+		else:
+			for entry in rows:
+				if entry is not None:
+					statements.append(f'INSERT INTO {table_name} ({columns}) VALUES {entry[1]};')
+
 		self.statements : list[str] = statements
-		return statements
+		return self.statements
 	
 	def execute_sql(self):
 		'''
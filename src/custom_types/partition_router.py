@@ -0,0 +1,178 @@
+from bisect import bisect_right
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any
+from helper_functions.parse_date import parse_date
+from helper_functions.parse_partition_bound import parse_partition_bound
+
+# Key: Postgres type name
+# Value: How values of that type are compared when routing
+KEY_TYPES = {
+	'int2': 'integer',
+	'int4': 'integer',
+	'int8': 'integer',
+	'numeric': 'numeric',
+	'float4': 'float',
+	'float8': 'float',
+	'date': 'date',
+	'timestamp': 'timestamp',
+	'text': 'text',
+	'varchar': 'text',
+	'enum': 'enum'
+}
+
+# Collations which order text by byte value, the same as Python compares strings.
+BYTE_ORDER_COLLATIONS = ('C', 'POSIX')
+
+class PartitionRouter:
+	'''
+	The PartitionRouter class picks the child partition of a partitioned table a row belongs in, the same way Postgres would when inserting through the parent table.
+
+	Only single column RANGE and LIST partitioning is supported. Both the partition bounds and the row values are converted according to the Postgres type of the key column, regardless of how the column was mapped.
+
+	:param strategy: The partitioning strategy of the table, either 'range' or 'list'.
+	:param key_column: The name of the database column the table is partitioned by.
+	:param key_type: The Postgres type name of the key column, or 'enum' for any enumerated type.
+	:param collation: The collation the partition key orders text by. Only needed for text keys.
+	:param scale: The number of decimal places a numeric key is rounded to, or None if it isn't limited.
+	'''
+	def __init__(self, strategy: str, key_column: str, key_type: str, collation: str | None = None, scale: int | None = None):
+		if strategy not in ('range', 'list'):
+			raise ValueError('Only RANGE and LIST partitioned tables can be routed.')
+
+		if key_type not in KEY_TYPES:
+			raise ValueError(f'Cannot route rows on a partition key of type {key_type}.')
+
+		self.strategy = strategy
+		self.key_column = key_column
+		self.key_type = KEY_TYPES[key_type]
+		self.scale = scale
+
+		# Enums are ordered by their declaration order and text by its collation, neither of which Python can reproduce.
+		if strategy == 'range' and self.key_type == 'enum':
+			raise ValueError('Cannot route rows on a RANGE partition key of an enumerated type.')
+
+		if strategy == 'range' and self.key_type == 'text' and collation not in BYTE_ORDER_COLLATIONS:
+			raise ValueError(f'Cannot route rows on a RANGE partition key of text using collation {collation}. Only C and POSIX collations are supported.')
+
+		self.default_partition : str | None = None
+
+		# Key: Value in the list
+		# Value: Partition name
+		self.list_partitions : dict[Any, str] = {}
+
+		# Range partitions are kept sorted by their lower bound so a row can be found with a binary search.
+		# The partition starting at MINVALUE, if any, is kept separately as it has no lower bound to sort on.
+		self.range_lowers : list[Any] = []
+		self.range_partitions : list[tuple[Any, str]] = []
+		self.unbounded_partition : tuple[Any, str] | None = None
+
+	def convert(self, value: Any) -> Any:
+		'''
+		Converts a bound literal or row value into a value which compares the same way Postgres would compare it.
+		'''
+		if value is None:
+			return None
+
+		match self.key_type:
+			case 'integer' | 'numeric' | 'float':
+				try:
+					converted = Decimal(str(value))
+				except InvalidOperation:
+					raise ValueError(f'Value {value} is not a valid number.')
+
+				if converted.is_nan():
+					raise ValueError('Cannot route NaN values.')
+
+				# Numbers are sent to Postgres as numeric literals, which it rounds half away from zero to fit the column.
+				# Quoted strings aren't rounded when cast to an integer, Postgres rejects them instead.
+				if self.key_type == 'integer':
+					if isinstance(value, str) and converted != converted.to_integral_value():
+						raise ValueError(f'Value {value} is not a valid integer.')
+
+					converted = converted.quantize(Decimal(1), rounding=ROUND_HALF_UP)
+				elif self.key_type == 'numeric' and self.scale is not None:
+					converted = converted.quantize(Decimal(1).scaleb(-self.scale), rounding=ROUND_HALF_UP)
+
+				return converted
+			case 'date':
+				if isinstance(value, datetime):
+					# Postgres would convert these to a date in the session timezone, which can't be known here.
+					if value.tzinfo is not None:
+						raise ValueError(f'Cannot route timezone aware value {value} on a date key.')
+
+					return value.date()
+				if isinstance(value, date):
+					return value
+				return parse_date(str(value)).date()
+			case 'timestamp':
+				if isinstance(value, datetime):
+					converted = value
+				elif isinstance(value, date):
+					converted = datetime(value.year, value.month, value.day)
+				else:
+					converted = parse_date(str(value))
+
+				# Postgres would shift these into the session timezone, which can't be known here.
+				if converted.tzinfo is not None:
+					raise ValueError(f'Cannot route timezone aware value {value} on a timestamp without time zone key.')
+
+				return converted
+			case _:
+				return str(value)
+
+	def add_partition(self, name: str, bound: str):
+		'''
+		Adds a child partition to route rows to.
+
+		:param name: The name of the child partition.
+		:param bound: The partition bound, as returned by pg_get_expr on pg_class.relpartbound.
+		'''
+		kind, literals = parse_partition_bound(bound)
+		values = [self.convert(literal) for literal in literals]
+
+		if kind == 'default':
+			self.default_partition = name
+		elif kind != self.strategy:
+			raise ValueError(f'Partition {name} does not match the partitioning strategy of the table.')
+		elif kind == 'list':
+			for value in values:
+				self.list_partitions[value] = name
+		else:
+			lower, upper = values
+
+			if lower is None:
+				self.unbounded_partition = (upper, name)
+			else:
+				index = bisect_right(self.range_lowers, lower)
+				self.range_lowers.insert(index, lower)
+				self.range_partitions.insert(index, (upper, name))
+
+	def route(self, value: Any) -> str | None:
+		'''
+		Returns the name of the partition the value belongs in, or None if no partition accepts it.
+		'''
+		value = self.convert(value)
+
+		if self.strategy == 'list':
+			return self.list_partitions.get(value, self.default_partition)
+
+		# NULLs can only ever go in the default partition of a range partitioned table.
+		if value is None:
+			return self.default_partition
+
+		# Find the last partition starting at or before the value.
+		index = bisect_right(self.range_lowers, value) - 1
+
+		if index >= 0:
+			upper, name = self.range_partitions[index]
+		elif self.unbounded_partition is not None:
+			upper, name = self.unbounded_partition
+		else:
+			return self.default_partition
+
+		# Upper bounds are exclusive.
+		if upper is None or value < upper:
+			return name
+
+		return self.default_partition
@@ -0,0 +1,11 @@
+from hashlib import blake2b
+
+def hash_key(values: list) -> bytes:
+	'''
+	Hash a list of parsed key values into a compact, fixed size digest.
+
+	Used to track which keys have already been seen without holding on to every key value.
+
+	:param values: The parsed values of the key columns for a single row.
+	'''
+	return blake2b(repr(tuple(values)).encode('utf-8'), digest_size=16).digest()
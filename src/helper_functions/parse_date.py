@@ -7,11 +7,15 @@ def parse_date(date_str : str) -> datetime:
 	Formats accepted are:
 	- YYYY-MM-DD
 	- YYYY-NN-DD HH:MM:SS
+	- Any other ISO 8601 format, such as those with fractional seconds or a UTC offset (YYYY-MM-DD HH:MM:SS.ffffff+HH:MM)
 
 	:param date_str: The date string to parse.
 	'''
 	
-	if ' ' in date_str:
-		return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-	else:
-		return datetime.strptime(date_str, '%Y-%m-%d')
\ No newline at end of file
+	try:
+		if ' ' in date_str:
+			return datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
+		else:
+			return datetime.strptime(date_str, '%Y-%m-%d')
+	except ValueError:
+		return datetime.fromisoformat(date_str)
@@ -0,0 +1,54 @@
+import re
+
+# Matches either a quoted literal (With '' as an escaped quote) or a bare word such as a number, NULL or MINVALUE.
+LITERAL_PATTERN = re.compile(r"'((?:[^']|'')*)'|([^,\s()]+)")
+
+def parse_partition_literals(literals: str) -> list[str | None]:
+	'''
+	Split a comma separated list of partition bound literals into their string values.
+
+	NULL, MINVALUE and MAXVALUE are all returned as None.
+	'''
+	values : list[str | None] = []
+
+	for match in LITERAL_PATTERN.finditer(literals):
+		quoted, bare = match.groups()
+
+		if quoted is not None:
+			values.append(quoted.replace("''", "'"))
+		elif bare.upper() in ('NULL', 'MINVALUE', 'MAXVALUE'):
+			values.append(None)
+		else:
+			values.append(bare)
+
+	return values
+
+def parse_partition_bound(bound: str) -> tuple[str, list[str | None]]:
+	'''
+	Parse a partition bound, as returned by pg_get_expr on pg_class.relpartbound.
+
+	Returns the kind of bound and its literal values:
+	- ('default', [])
+	- ('list', [value, ...]) where None is NULL
+	- ('range', [lower, upper]) where None is MINVALUE or MAXVALUE
+
+	:param bound: The partition bound, such as FOR VALUES FROM ('2024-01-01') TO ('2025-01-01').
+	'''
+	if bound.strip().upper() == 'DEFAULT':
+		return ('default', [])
+
+	match = re.fullmatch(r'FOR VALUES IN \((.*)\)', bound.strip(), re.DOTALL)
+	if match:
+		return ('list', parse_partition_literals(match.group(1)))
+
+	match = re.fullmatch(r'FOR VALUES FROM \((.*)\) TO \((.*)\)', bound.strip(), re.DOTALL)
+	if match:
+		lower = parse_partition_literals(match.group(1))
+		upper = parse_partition_literals(match.group(2))
+
+		if len(lower) != 1 or len(upper) != 1:
+			raise ValueError('Only single column partition keys are supported.')
+
+		return ('range', [lower[0], upper[0]])
+
+	raise ValueError(f'Unsupported partition bound: {bound}')
@@ -161,7 +161,8 @@ if __name__ == '__main__':
 		# 	{
 		#      "columnName": "Excel Column Name",
 		#      "dbColumnName": "Database Column Name",
-		#      "columnType": "Data Type"
+		#      "columnType": "Data Type",
+		#      "key": true (Optional)
 		#   }
 		# ]
 
@@ -170,12 +171,18 @@ if __name__ == '__main__':
 			table_column_name : str = column['columnName']
 			db_column_name : str = column['dbColumnName']
 			column_type : str = column['columnType']
+			is_key = column.get('key', False)
 
 			# Validate that the JSON structure is correct.
 			if not table_column_name or not db_column_name or not column_type:
 				print('Invalid JSON structure.')
 				exit(1)
 			
+			# Key must be an actual JSON boolean, so "false" isn't treated as true.
+			if not isinstance(is_key, bool):
+				print(f'Invalid key value for column {table_column_name}, must be true or false.')
+				exit(1)
+
 			# Check that the DB column name is a valid identifier
 			if not ident_check(db_column_name):
 				print(f'Invalid database column name: {db_column_name}')
@@ -198,7 +205,8 @@ if __name__ == '__main__':
 			data_type_object = DataType(
 				table_column_name=table_column_name,
 				db_column_name=column['dbColumnName'],
-				data_type=column['columnType']
+				data_type=column['columnType'],
+				is_key=is_key
 			)
 
 			data_types[table_column_name] = data_type_object
@@ -248,6 +256,11 @@ if __name__ == '__main__':
 
 			data_types[column_name] = data_type_object
 
+	# Key columns can only be set in the JSON file, so --duplicate-keys would otherwise silently do nothing.
+	if args.duplicatekeys and not any(data_type.is_key for data_type in data_types.values()):
+		print('--duplicate-keys requires key columns to be set in the JSON file.')
+		exit(1)
+
 	# Validate that the column names exist in the database.
 	db_column_names = [data_type.db_column_name for data_type in data_types.values()]
 
@@ -299,7 +312,14 @@ if __name__ == '__main__':
 		randidlen = args.randcollength or None
 
 	# Generate the SQL
-	cursor.generate_sql(table_name=table_name, randidcol=randidcol or None, randidlen=randidlen or None)
+	try:
+		cursor.generate_sql(table_name=table_name, randidcol=randidcol or None, randidlen=randidlen or None, duplicate_keys=args.duplicatekeys or 'error', route_partitions=args.routepartitions)
+	except ValueError as e:
+		print(e)
+		exit(1)
+
+	if cursor.duplicate_count:
+		print(f'Dropped {cursor.duplicate_count} rows with duplicate keys, keeping the {args.duplicatekeys} row seen.')
 
 	print('SQL generated.')
 